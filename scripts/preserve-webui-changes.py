@@ -4,17 +4,38 @@ Smart WebUI preservation script for MCPO updates.
 This script automatically re-applies WebUI modifications to main.py after upstream merges.
 """
 
+import functools
 import re
 import sys
 import os
 from pathlib import Path
 
+# Patterns used to locate insertion points in main.py, compiled once at import.
+# The import strategies share one alternation so the file is only scanned once.
+IMPORT_COMBINED_RE = re.compile(
+    r'(?P<utils>from mcpo\.utils\.[^\s]+ import [^\n]+)'
+    r'|(?P<mcpo>from mcpo[^\n]*\n)(?!\s*from mcpo)'
+    r'|(?P<imp>\nimport [^\n]*\n)(?!\s*(?:import|from))'
+)
+CORS_RE = re.compile(r'(main_app\.add_middleware\(\s*CORSMiddleware[^}]+}\s*\))', re.DOTALL)
+API_KEY_RE = re.compile(r'(if api_key and strict_auth:\s*main_app\.add_middleware\(APIKeyMiddleware[^\n]*\))', re.DOTALL)
+HEADERS_RE = re.compile(r'(\s+headers = kwargs\.get\("headers"\))')
+
+@functools.lru_cache(maxsize=4)
+def _read_file(path, mtime_ns, size):
+    with open(path, 'r') as f:
+        return f.read()
+
+def _cached_read(path):
+    """Read a file, reusing the previous content while it is unchanged on disk"""
+    st = os.stat(path)
+    return _read_file(path, st.st_mtime_ns, st.st_size)
+
 def backup_webui_changes(main_py_path):
     """Extract and backup current WebUI modifications"""
     print("📦 Backing up current WebUI modifications...")
     
-    with open(main_py_path, 'r') as f:
-        content = f.read()
+    content = _cached_read(main_py_path)
     
     webui_changes = {
         'has_webui_import': 'from mcpo.utils.web_interface import create_web_interface_router' in content,
@@ -23,21 +44,14 @@ def backup_webui_changes(main_py_path):
         'router_location': None
     }
     
-    # Find where the import is located
-    if webui_changes['has_webui_import']:
-        lines = content.split('\n')
-        for i, line in enumerate(lines):
-            if 'from mcpo.utils.web_interface import create_web_interface_router' in line:
-                webui_changes['import_location'] = i
-                break
-    
-    # Find where the router is added
-    if webui_changes['has_webui_router']:
-        lines = content.split('\n')
-        for i, line in enumerate(lines):
-            if 'create_web_interface_router(' in line:
-                webui_changes['router_location'] = i
-                break
+    # Line numbers are the count of newlines before the first occurrence
+    import_idx = content.find('from mcpo.utils.web_interface import create_web_interface_router')
+    if import_idx != -1:
+        webui_changes['import_location'] = content.count('\n', 0, import_idx)
+    
+    router_idx = content.find('create_web_interface_router(')
+    if router_idx != -1:
+        webui_changes['router_location'] = content.count('\n', 0, router_idx)
     
     return webui_changes
 
@@ -45,8 +59,7 @@ def apply_webui_modifications(main_py_path, force=False):
     """Apply WebUI modifications to main.py"""
     print(f"🔧 Applying WebUI modifications to {main_py_path}...")
     
-    with open(main_py_path, 'r') as f:
-        content = f.read()
+    content = _cached_read(main_py_path)
     
     modified = False
     
@@ -55,33 +68,31 @@ def apply_webui_modifications(main_py_path, force=False):
     if webui_import not in content:
         print("  ➕ Adding WebUI import...")
         
-        # Strategy 1: Add after other mcpo.utils imports
-        utils_import_pattern = r'(from mcpo\.utils\.[^\s]+ import [^\n]+)'
-        matches = list(re.finditer(utils_import_pattern, content))
+        # Remember the last match of each strategy from a single scan
+        last_matches = {}
+        for match in IMPORT_COMBINED_RE.finditer(content):
+            last_matches[match.lastgroup] = match
         
-        if matches:
-            # Add after the last mcpo.utils import
-            last_match = matches[-1]
-            insert_pos = last_match.end()
+        if 'utils' in last_matches:
+            # Strategy 1: Add after the last mcpo.utils import
+            insert_pos = last_matches['utils'].end()
             content = content[:insert_pos] + '\n' + webui_import + content[insert_pos:]
             modified = True
             print("    ✅ Added after existing mcpo.utils imports")
-        else:
+        elif 'mcpo' in last_matches:
             # Strategy 2: Add after mcpo imports section
-            mcpo_import_pattern = r'(from mcpo[^\n]*\n)(?!\s*from mcpo)'
-            if re.search(mcpo_import_pattern, content):
-                content = re.sub(mcpo_import_pattern, r'\1' + webui_import + '\n', content)
-                modified = True
-                print("    ✅ Added after mcpo imports section")
-            else:
-                # Strategy 3: Add after all imports
-                import_end_pattern = r'(\nimport [^\n]*\n)(?!\s*(?:import|from))'
-                if re.search(import_end_pattern, content):
-                    content = re.sub(import_end_pattern, r'\1\n' + webui_import + '\n', content)
-                    modified = True
-                    print("    ✅ Added after all imports")
-                else:
-                    print("    ❌ Could not find suitable location for import")
+            insert_pos = last_matches['mcpo'].end()
+            content = content[:insert_pos] + webui_import + '\n' + content[insert_pos:]
+            modified = True
+            print("    ✅ Added after mcpo imports section")
+        elif 'imp' in last_matches:
+            # Strategy 3: Add after all imports
+            insert_pos = last_matches['imp'].end()
+            content = content[:insert_pos] + '\n' + webui_import + '\n' + content[insert_pos:]
+            modified = True
+            print("    ✅ Added after all imports")
+        else:
+            print("    ❌ Could not find suitable location for import")
     else:
         print("  ✅ WebUI import already present")
     
@@ -96,34 +107,33 @@ def apply_webui_modifications(main_py_path, force=False):
     if 'create_web_interface_router(' not in content or 'main_app.include_router(web_router)' not in content:
         print("  ➕ Adding WebUI router integration...")
         
+        # Each regex is guarded by a cheap substring check so files without the
+        # anchor skip the backtracking search entirely
         # Strategy 1: Add after CORS middleware setup
-        cors_pattern = r'(main_app\.add_middleware\(\s*CORSMiddleware[^}]+}\s*\))'
-        cors_match = re.search(cors_pattern, content, re.DOTALL)
+        cors_match = CORS_RE.search(content) if 'CORSMiddleware' in content else None
         
         if cors_match:
             insert_pos = cors_match.end()
             # Find the end of the line
-            while insert_pos < len(content) and content[insert_pos] != '\n':
-                insert_pos += 1
+            nl = content.find('\n', insert_pos)
+            insert_pos = len(content) if nl == -1 else nl
             content = content[:insert_pos] + '\n\n' + webui_router_code + content[insert_pos:]
             modified = True
             print("    ✅ Added after CORS middleware")
         else:
             # Strategy 2: Add after API key middleware
-            api_key_pattern = r'(if api_key and strict_auth:\s*main_app\.add_middleware\(APIKeyMiddleware[^\n]*\))'
-            api_key_match = re.search(api_key_pattern, content, re.DOTALL)
+            api_key_match = API_KEY_RE.search(content) if 'APIKeyMiddleware' in content else None
             
             if api_key_match:
                 insert_pos = api_key_match.end()
-                while insert_pos < len(content) and content[insert_pos] != '\n':
-                    insert_pos += 1
+                nl = content.find('\n', insert_pos)
+                insert_pos = len(content) if nl == -1 else nl
                 content = content[:insert_pos] + '\n\n' + webui_router_code + content[insert_pos:]
                 modified = True
                 print("    ✅ Added after API key middleware")
             else:
                 # Strategy 3: Add before headers processing
-                headers_pattern = r'(\s+headers = kwargs\.get\("headers"\))'
-                headers_match = re.search(headers_pattern, content)
+                headers_match = HEADERS_RE.search(content) if 'headers = kwargs.get' in content else None
                 
                 if headers_match:
                     content = content[:headers_match.start()] + '\n' + webui_router_code + '\n' + content[headers_match.start():]
@@ -138,6 +148,7 @@ def apply_webui_modifications(main_py_path, force=False):
         # Write the modified content
         with open(main_py_path, 'w') as f:
             f.write(content)
+        _read_file.cache_clear()
         print(f"✅ Successfully applied WebUI modifications to {main_py_path}")
     else:
         print("✅ No modifications needed - WebUI integration already present")
@@ -148,14 +159,14 @@ def verify_webui_integration(main_py_path):
     """Verify that WebUI integration is properly applied"""
     print(f"🔍 Verifying WebUI integration in {main_py_path}...")
     
-    with open(main_py_path, 'r') as f:
-        content = f.read()
+    content = _cached_read(main_py_path)
     
     checks = {
         'import': 'from mcpo.utils.web_interface import create_web_interface_router' in content,
         'router_creation': 'create_web_interface_router(' in content,
         'router_include': 'main_app.include_router(web_router)' in content,
-        'webui_file': os.path.exists('src/mcpo/utils/web_interface.py')
+        'webui_file': os.path.exists('src/mcpo/utils/web_interface.py'),
+        'webui_html': os.path.exists('src/mcpo/utils/web_interface.html')
     }
     
     print("  Verification results:")
@@ -190,9 +201,8 @@ def main():
     if command == "apply":
         force = "--force" in sys.argv
         modified = apply_webui_modifications(main_py_path, force)
-        if modified:
-            verify_webui_integration(main_py_path)
-        sys.exit(0 if modified or verify_webui_integration(main_py_path) else 1)
+        success = verify_webui_integration(main_py_path)
+        sys.exit(0 if modified or success else 1)
     
     elif command == "verify":
         success = verify_webui_integration(main_py_path)
@@ -122,27 +122,36 @@ def main(
     if not path_prefix.startswith("/"):
         path_prefix = f"/{path_prefix}"
 
+    # Use uvloop for the server's event loop when it is installed
+    try:
+        import uvloop
+
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = None
+
     # Run your async run function from mcpo.main
-    asyncio.run(
-        run(
-            host,
-            port,
-            api_key=api_key,
-            strict_auth=strict_auth,
-            cors_allow_origins=cors_allow_origins,
-            server_type=server_type,
-            config_path=config_path,
-            name=name,
-            description=description,
-            version=version,
-            server_command=server_command,
-            ssl_certfile=ssl_certfile,
-            ssl_keyfile=ssl_keyfile,
-            path_prefix=path_prefix,
-            headers=headers,
-            hot_reload=hot_reload,
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(
+            run(
+                host,
+                port,
+                api_key=api_key,
+                strict_auth=strict_auth,
+                cors_allow_origins=cors_allow_origins,
+                server_type=server_type,
+                config_path=config_path,
+                name=name,
+                description=description,
+                version=version,
+                server_command=server_command,
+                ssl_certfile=ssl_certfile,
+                ssl_keyfile=ssl_keyfile,
+                path_prefix=path_prefix,
+                headers=headers,
+                hot_reload=hot_reload,
+            )
         )
-    )
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ from urllib.parse import urljoin
 import uvicorn
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from starlette.routing import Mount
 
 from mcp import ClientSession, StdioServerParameters
@@ -524,6 +525,9 @@ async def run(
         allow_headers=["*"],
     )
 
+    # Compress larger responses such as the web UI page and tool results
+    main_app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
     # Add middleware to protect also documentation and spec
     if api_key and strict_auth:
         main_app.add_middleware(APIKeyMiddleware, api_key=api_key)
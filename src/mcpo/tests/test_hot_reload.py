@@ -142,3 +142,27 @@ def test_config_watcher_initialization():
         assert watcher.reload_callback == callback
     finally:
         os.unlink(config_path)
+
+
+@pytest.mark.asyncio
+async def test_config_change_handler_reads_new_config():
+    """Test a config change reads the file and passes it to the callback."""
+    from pathlib import Path
+    from mcpo.utils.config_watcher import ConfigChangeHandler
+
+    config_data = {"mcpServers": {"test": {"command": "echo", "args": ["hello"]}}}
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        json.dump(config_data, f)
+        config_path = f.name
+
+    try:
+        callback = AsyncMock()
+        handler = ConfigChangeHandler(
+            Path(config_path), callback, asyncio.get_running_loop()
+        )
+        handler._debounce_delay = 0
+
+        await handler._handle_config_change()
+        callback.assert_awaited_once_with(config_data)
+    finally:
+        os.unlink(config_path)
@@ -0,0 +1,298 @@
+import asyncio
+import errno
+import json
+import os
+import stat
+import tempfile
+from unittest.mock import patch
+
+import aiofiles.os
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from mcpo.utils import web_interface
+from mcpo.utils.web_interface import create_web_interface_router
+
+
+def make_client(config_path):
+    app = FastAPI()
+    app.include_router(create_web_interface_router(config_path=config_path))
+    return TestClient(app)
+
+
+def test_web_interface_served_with_etag():
+    """Test the web interface HTML is served with cache validators."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        client = make_client(os.path.join(tmpdir, "config.json"))
+
+        response = client.get("/webui/")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/html; charset=utf-8"
+        assert "MCPO Configuration Manager" in response.text
+        assert response.headers["etag"]
+
+
+def test_web_interface_gzip():
+    """Test the web interface is served precompressed only when accepted."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        client = make_client(os.path.join(tmpdir, "config.json"))
+
+        response = client.get("/webui/", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "MCPO Configuration Manager" in response.text
+
+        response = client.get("/webui/", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert "MCPO Configuration Manager" in response.text
+
+
+def test_web_interface_not_modified():
+    """Test each encoding has its own ETag and either one returns 304."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        client = make_client(os.path.join(tmpdir, "config.json"))
+
+        etags = {}
+        for encoding in ("identity", "gzip"):
+            headers = {"Accept-Encoding": encoding}
+            etags[encoding] = client.get("/webui/", headers=headers).headers["etag"]
+            response = client.get(
+                "/webui/", headers={**headers, "If-None-Match": etags[encoding]}
+            )
+            assert response.status_code == 304
+            assert response.content == b""
+            assert response.headers["etag"] == etags[encoding]
+        assert etags["identity"] != etags["gzip"]
+
+
+def test_get_config_missing_file():
+    """Test a missing config file yields an empty server map."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        client = make_client(os.path.join(tmpdir, "config.json"))
+
+        response = client.get("/webui/config")
+        assert response.status_code == 200
+        assert response.json() == {"mcpServers": {}}
+
+
+def test_save_and_delete_config():
+    """Test saving a config, reading it back and deleting a server."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.json")
+        client = make_client(config_path)
+
+        config_data = {
+            "mcpServers": {
+                "time": {"command": "uvx", "args": ["mcp-server-time"], "env": None},
+                "remote": {"type": "sse", "url": "http://example.com/sse"},
+            }
+        }
+        response = client.post("/webui/config", json=config_data)
+        assert response.status_code == 200
+
+        with open(config_path) as f:
+            saved = json.load(f)
+        assert saved["mcpServers"]["time"] == {
+            "command": "uvx",
+            "args": ["mcp-server-time"],
+        }
+        assert client.get("/webui/config").json() == saved
+
+        response = client.delete("/webui/config/server/time")
+        assert response.status_code == 200
+        assert list(client.get("/webui/config").json()["mcpServers"]) == ["remote"]
+
+        response = client.delete("/webui/config/server/time")
+        assert response.status_code == 404
+
+
+def test_get_config_sees_external_changes():
+    """Test the cached config is refreshed when the file changes on disk."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.json")
+        client = make_client(config_path)
+
+        with open(config_path, "w") as f:
+            json.dump({"mcpServers": {"a": {"command": "echo"}}}, f)
+        assert list(client.get("/webui/config").json()["mcpServers"]) == ["a"]
+
+        with open(config_path, "w") as f:
+            json.dump({"mcpServers": {"bb": {"command": "echo"}}}, f)
+        assert list(client.get("/webui/config").json()["mcpServers"]) == ["bb"]
+
+
+def test_save_config_invalid():
+    """Test an invalid config is rejected without touching the file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.json")
+        client = make_client(config_path)
+
+        response = client.post("/webui/config", json={"servers": {}})
+        assert response.status_code == 400
+        assert not os.path.exists(config_path)
+
+
+def test_save_config_creates_directory():
+    """Test saving creates the config directory when it does not exist."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "nested", "config.json")
+        client = make_client(config_path)
+
+        response = client.post("/webui/config", json={"mcpServers": {}})
+        assert response.status_code == 200
+        with open(config_path) as f:
+            assert json.load(f) == {"mcpServers": {}}
+
+
+def test_save_config_is_atomic():
+    """Test saving replaces the file without leaving temp files behind."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.json")
+        client = make_client(config_path)
+
+        with patch("mcpo.utils.web_interface.aiofiles.os.replace", wraps=aiofiles.os.replace) as replace:
+            response = client.post("/webui/config", json={"mcpServers": {}})
+        assert response.status_code == 200
+        replace.assert_called_once()
+        assert os.listdir(tmpdir) == ["config.json"]
+
+
+def test_save_config_preserves_file_mode():
+    """Test saving over an existing config keeps its permission bits."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.json")
+        with open(config_path, "w") as f:
+            json.dump({"mcpServers": {}}, f)
+        os.chmod(config_path, 0o600)
+        client = make_client(config_path)
+
+        response = client.post(
+            "/webui/config", json={"mcpServers": {"a": {"command": "echo"}}}
+        )
+        assert response.status_code == 200
+        assert stat.S_IMODE(os.stat(config_path).st_mode) == 0o600
+
+
+def test_save_config_falls_back_to_in_place_write():
+    """Test saving still works when the file cannot be replaced by rename."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.json")
+        client = make_client(config_path)
+
+        busy = OSError(errno.EBUSY, "Device or resource busy")
+        with patch("mcpo.utils.web_interface.aiofiles.os.replace", side_effect=busy):
+            response = client.post(
+                "/webui/config", json={"mcpServers": {"a": {"command": "echo"}}}
+            )
+        assert response.status_code == 200
+        assert os.listdir(tmpdir) == ["config.json"]
+        with open(config_path) as f:
+            assert json.load(f) == {"mcpServers": {"a": {"command": "echo"}}}
+
+
+def test_save_config_disk_full_keeps_original():
+    """Test a failed temp write leaves the existing config untouched."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.json")
+        original = {"mcpServers": {"keep": {"command": "echo"}}}
+        with open(config_path, "w") as f:
+            json.dump(original, f)
+        client = make_client(config_path)
+
+        class FullDiskFile:
+            async def write(self, data):
+                raise OSError(errno.ENOSPC, "No space left on device")
+
+            async def close(self):
+                pass
+
+        async def failing_open(path, mode="r", *args, **kwargs):
+            # Create the temp file for real so its cleanup is exercised too
+            assert ".tmp." in str(path)
+            open(path, mode).close()
+            return FullDiskFile()
+
+        with patch("mcpo.utils.web_interface.aiofiles.open", side_effect=failing_open):
+            response = client.post(
+                "/webui/config", json={"mcpServers": {"new": {"command": "echo"}}}
+            )
+        assert response.status_code == 500
+        assert os.listdir(tmpdir) == ["config.json"]
+        with open(config_path) as f:
+            assert json.load(f) == original
+
+
+def test_save_config_malformed_json():
+    """Test a body that is not valid JSON is rejected as an invalid config."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.json")
+        client = make_client(config_path)
+
+        response = client.post(
+            "/webui/config",
+            content=b"{not json",
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status_code == 400
+        assert not os.path.exists(config_path)
+
+
+def test_save_config_bare_filename(monkeypatch):
+    """Test saving to a path without a directory part writes to the cwd."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        monkeypatch.chdir(tmpdir)
+        client = make_client("config.json")
+
+        response = client.post("/webui/config", json={"mcpServers": {}})
+        assert response.status_code == 200
+        assert os.listdir(tmpdir) == ["config.json"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_saves_are_coalesced():
+    """Test saves queued behind an in-flight write collapse into one write."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_path = os.path.join(tmpdir, "config.json")
+        app = FastAPI()
+        app.include_router(create_web_interface_router(config_path=config_path))
+
+        writes = []
+        real_write = web_interface._write_file_atomic
+
+        async def slow_write(path, data):
+            writes.append(json.loads(data))
+            await asyncio.sleep(0.05)
+            await real_write(path, data)
+
+        transport = httpx.ASGITransport(app=app)
+        with patch.object(web_interface, "_write_file_atomic", slow_write):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as client:
+                responses = await asyncio.gather(
+                    *(
+                        client.post(
+                            "/webui/config",
+                            json={"mcpServers": {f"s{i}": {"command": "echo"}}},
+                        )
+                        for i in range(3)
+                    )
+                )
+
+        assert all(r.status_code == 200 for r in responses)
+        assert len(writes) == 2
+        with open(config_path) as f:
+            assert json.load(f) == writes[-1]
+
+
+def test_save_config_documents_request_body():
+    """Test the raw-body POST endpoint still documents its MCPConfig body."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        client = make_client(os.path.join(tmpdir, "config.json"))
+
+        openapi = client.get("/openapi.json").json()
+        body = openapi["paths"]["/webui/config"]["post"]["requestBody"]
+        ref = body["content"]["application/json"]["schema"]["$ref"]
+        assert ref == "#/components/schemas/MCPConfig"
+        assert "MCPConfig" in openapi["components"]["schemas"]
@@ -29,16 +29,16 @@ class ConfigChangeHandler(FileSystemEventHandler):
 
         # Check if the modified file is our config file
         event_path = Path(event.src_path).resolve()
-        logger.debug(f"File modified: {event_path}, watching: {self.config_path}")
+        logger.debug("File modified: %s, watching: %s", event_path, self.config_path)
 
         # Also check for file name match in case of temporary files or atomic writes
         if (event_path == self.config_path or
             event_path.name == self.config_path.name and event_path.parent == self.config_path.parent):
 
-            logger.info(f"Config file modified: {self.config_path}")
+            logger.info("Config file modified: %s", self.config_path)
             self._trigger_reload()
         else:
-            logger.debug(f"File {event_path} modified but not our config file {self.config_path}")
+            logger.debug("File %s modified but not our config file %s", event_path, self.config_path)
 
     def on_moved(self, event):
         """Handle file move events (atomic writes)."""
@@ -47,12 +47,12 @@ class ConfigChangeHandler(FileSystemEventHandler):
 
         # Check if the destination is our config file (atomic write pattern)
         dest_path = Path(event.dest_path).resolve()
-        logger.debug(f"File moved: {event.src_path} -> {dest_path}, watching: {self.config_path}")
+        logger.debug("File moved: %s -> %s, watching: %s", event.src_path, dest_path, self.config_path)
 
         if (dest_path == self.config_path or
             dest_path.name == self.config_path.name and dest_path.parent == self.config_path.parent):
 
-            logger.info(f"Config file replaced via move: {self.config_path}")
+            logger.info("Config file replaced via move: %s", self.config_path)
             self._trigger_reload()
 
     def on_created(self, event):
@@ -62,12 +62,12 @@ class ConfigChangeHandler(FileSystemEventHandler):
 
         # Check if the created file is our config file
         event_path = Path(event.src_path).resolve()
-        logger.debug(f"File created: {event_path}, watching: {self.config_path}")
+        logger.debug("File created: %s, watching: %s", event_path, self.config_path)
 
         if (event_path == self.config_path or
             event_path.name == self.config_path.name and event_path.parent == self.config_path.parent):
 
-            logger.info(f"Config file created: {self.config_path}")
+            logger.info("Config file created: %s", self.config_path)
             self._trigger_reload()
 
     def _trigger_reload(self):
@@ -76,40 +76,44 @@ class ConfigChangeHandler(FileSystemEventHandler):
 
         # Debounce rapid file changes
         if current_time - self._last_modification < self._debounce_delay:
-            logger.debug(f"Debouncing file change (too soon): {current_time - self._last_modification:.2f}s")
+            logger.debug("Debouncing file change (too soon): %.2fs", current_time - self._last_modification)
             return
 
         self._last_modification = current_time
-        logger.info(f"Config file change detected: {self.config_path}")
+        logger.info("Config file change detected: %s", self.config_path)
 
         # Schedule the reload callback using the stored loop reference
         try:
             # Use call_soon_threadsafe to schedule the coroutine from a different thread
             future = asyncio.run_coroutine_threadsafe(self._handle_config_change(), self.loop)
-            logger.debug(f"Scheduled config reload task from thread: {future}")
+            logger.debug("Scheduled config reload task from thread: %s", future)
         except Exception as e:
-            logger.error(f"Failed to schedule config reload: {e}")
+            logger.error("Failed to schedule config reload: %s", e)
+
+    def _read_config(self) -> Dict[str, Any]:
+        """Read and parse the config file (blocking)."""
+        with open(self.config_path, 'r') as f:
+            return json.load(f)
 
     async def _handle_config_change(self):
         """Handle config change with proper error handling."""
         try:
             await asyncio.sleep(self._debounce_delay)  # Additional debounce
 
-            logger.debug(f"Processing config file change: {self.config_path}")
+            logger.debug("Processing config file change: %s", self.config_path)
 
-            # Read and validate the new config
-            with open(self.config_path, 'r') as f:
-                new_config = json.load(f)
+            # Read and validate the new config off the event loop
+            new_config = await asyncio.to_thread(self._read_config)
 
             # Call the reload callback
             await self.reload_callback(new_config)
 
         except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in config file: {e}")
+            logger.error("Invalid JSON in config file: %s", e)
         except FileNotFoundError:
-            logger.error(f"Config file not found: {self.config_path}")
+            logger.error("Config file not found: %s", self.config_path)
         except Exception as e:
-            logger.error(f"Error reloading config: {e}")
+            logger.error("Error reloading config: %s", e)
 
 
 class ConfigWatcher:
@@ -125,7 +129,7 @@ class ConfigWatcher:
     def start(self):
         """Start watching the config file."""
         if not self.config_path.exists():
-            logger.error(f"Config file does not exist: {self.config_path}")
+            logger.error("Config file does not exist: %s", self.config_path)
             return
 
         # Get the current event loop
@@ -140,19 +144,19 @@ class ConfigWatcher:
 
         # Watch the directory containing the config file
         watch_dir = self.config_path.parent
-        logger.debug(f"Watching directory: {watch_dir} for file: {self.config_path}")
+        logger.debug("Watching directory: %s for file: %s", watch_dir, self.config_path)
         self.observer.schedule(self.handler, str(watch_dir), recursive=False)
 
         self.observer.start()
-        logger.info(f"Started watching config file: {self.config_path}")
-        logger.debug(f"File watcher is alive: {self.observer.is_alive()}")
+        logger.info("Started watching config file: %s", self.config_path)
+        logger.debug("File watcher is alive: %s", self.observer.is_alive())
 
     def stop(self):
         """Stop watching the config file."""
         if self.observer:
             self.observer.stop()
             self.observer.join()
-            logger.info(f"Stopped watching config file: {self.config_path}")
+            logger.info("Stopped watching config file: %s", self.config_path)
 
     def __enter__(self):
         self.start()